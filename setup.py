@@ -23,12 +23,17 @@ setup(
     install_requires=[
         'pandas',
         'numpy',
+        'numba',
         'pydicom>=1.0',
         'numpy-stl',
         'plotly==4.12',
+        'pydantic>=2',
         'scipy',
         'tqdm'
     ],
+    extras_require={
+        'gpu': ['cupy']
+    },
     include_package_data=True,
     zip_safe=False
 )
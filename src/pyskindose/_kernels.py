@@ -0,0 +1,322 @@
+from typing import List, Tuple
+
+import numpy as np
+from numba import njit, prange
+
+
+# Leaf size and bounding box margin (cm) of the skin cell BVH. The margin
+# ensures that the culling is conservative with respect to round-off errors.
+BVH_LEAF_SIZE = 32
+BVH_MARGIN = 1e-6
+
+# Maximum number of elements of the largest temporary array, of shape
+# (events, skin cells, 4), in the batched hit test. The events are processed
+# in chunks to keep the temporaries below this size, about 128 MB in float64.
+BATCH_MAX_ARRAY_SIZE = 2 ** 24
+
+
+@njit(fastmath=True, cache=True)
+def _cell_hit(source: np.array, N: np.array, r: np.array, n: np.array,
+              is_3d: bool, cell: int) -> bool:
+    """Check if a single skin cell is an entrance skin cell hit by the beam.
+
+    See check_hit_kernel for a description of the parameters.
+
+    """
+    # Vector from X-ray source to skin cell
+    v0 = r[cell, 0] - source[0]
+    v1 = r[cell, 1] - source[1]
+    v2 = r[cell, 2] - source[2]
+
+    # The cell lies within the beam if it is on the inside of all faces.
+    # Most cells are outside the beam, so return as soon as one face fails.
+    for face in range(4):
+        if v0 * N[face, 0] + v1 * N[face, 1] + v2 * N[face, 2] > 0:
+            return False
+
+    # Remove exit path skin cells
+    if is_3d:
+        return v0 * n[cell, 0] + v1 * n[cell, 1] + v2 * n[cell, 2] <= 0
+
+    return True
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def check_hit_kernel(source: np.array, N: np.array, r: np.array,
+                     n: np.array, is_3d: bool) -> np.array:
+    """Calculate which skin cells are hit by a pyramid shaped X-ray beam.
+
+    Each skin cell is tested against the four faces of the beam in a single
+    pass, so that no temporary source-to-cell vectors or per face dot product
+    matrices need to be allocated. The face tests of a cell stop at the first
+    face that the cell lies outside of.
+
+    Parameters
+    ----------
+    source : np.array
+        (x,y,z) coordinates to the X-ray source
+    N : np.array
+        4*3 array, where each row contains a normal vector to one of the four
+        faces of the beam, see Beam.N
+    r : np.array
+        n*3 array, where each row contains the xyz coordinate of one of the
+        phantom skin cells
+    n : np.array
+        n*3 array of normal vectors to each of the phantom skin cells. Only
+        used if is_3d is True.
+    is_3d : bool
+        If True, skin cells on the beams exit path are excluded, i.e. cells
+        whose normal vector points away from the X-ray source.
+
+    Returns
+    -------
+    np.array
+        A boolean array of the same length as the number of skin cells. True
+        for all entrance skin cells that are hit by the beam.
+
+    """
+    hits = np.zeros(r.shape[0], dtype=np.bool_)
+
+    for cell in prange(r.shape[0]):
+        hits[cell] = _cell_hit(source, N, r, n, is_3d, cell)
+
+    return hits
+
+
+def build_bvh(r: np.array, leaf_size: int = BVH_LEAF_SIZE) -> Tuple[np.array]:
+    """Build a bounding volume hierarchy (BVH) over the phantom skin cells.
+
+    The tree is built top-down by splitting each node at the median of its
+    longest axis, until the nodes contain at most leaf_size skin cells.
+
+    Parameters
+    ----------
+    r : np.array
+        n*3 array, where each row contains the xyz coordinate of one of the
+        phantom skin cells
+    leaf_size : int, optional
+        Maximum number of skin cells in the leaf nodes.
+
+    Returns
+    -------
+    Tuple[np.array]
+        order: skin cell indices, sorted so that each node spans a contiguous
+        range of it.
+        node_min, node_max: lower and upper corners of the axis aligned
+        bounding box of each node.
+        node_children: indices of the two child nodes of each node, -1 for
+        leaf nodes.
+        node_range: start and end index in order for each node.
+
+    """
+    order = np.arange(len(r))
+    node_min: List[np.array] = [None]
+    node_max: List[np.array] = [None]
+    node_children: List[List[int]] = [[-1, -1]]
+    node_range: List[List[int]] = [[0, len(r)]]
+
+    # Stack of node indices to process, starting with the root node
+    stack = [0]
+
+    while stack:
+        node = stack.pop()
+        start, end = node_range[node]
+        cells = order[start:end]
+
+        node_min[node] = r[cells].min(axis=0) - BVH_MARGIN
+        node_max[node] = r[cells].max(axis=0) + BVH_MARGIN
+
+        if end - start <= leaf_size:
+            continue
+
+        # Split at the median of the longest axis
+        axis = np.argmax(node_max[node] - node_min[node])
+        mid = (start + end) // 2
+        order[start:end] = cells[
+            np.argpartition(r[cells, axis], mid - start)]
+
+        children = []
+        for child_range in [[start, mid], [mid, end]]:
+            children.append(len(node_range))
+            node_range.append(child_range)
+            node_children.append([-1, -1])
+            node_min.append(None)
+            node_max.append(None)
+
+        node_children[node] = children
+        stack.extend(children)
+
+    return (order, np.array(node_min), np.array(node_max),
+            np.array(node_children), np.array(node_range))
+
+
+@njit(fastmath=True, cache=True)
+def _outside_beam(source: np.array, N: np.array, box_min: np.array,
+                  box_max: np.array) -> bool:
+    """Check if a bounding box lies entirely outside any face of the beam."""
+    for face in range(4):
+        # Smallest value of (x - source) dot N over all points x in the box
+        d = 0.0
+        for axis in range(3):
+            if N[face, axis] >= 0:
+                d += N[face, axis] * (box_min[axis] - source[axis])
+            else:
+                d += N[face, axis] * (box_max[axis] - source[axis])
+
+        if d > 0:
+            return True
+
+    return False
+
+
+@njit(cache=True)
+def check_hit_bvh(source: np.array, N: np.array, r: np.array, n: np.array,
+                  is_3d: bool, source_ref: np.array, N_ref: np.array,
+                  order: np.array, node_min: np.array, node_max: np.array,
+                  node_children: np.array, node_range: np.array) -> np.array:
+    """Calculate which skin cells are hit by the beam, using a BVH.
+
+    Nodes of the BVH that lie entirely outside the beam are culled, and only
+    the skin cells in the remaining leaf nodes are tested with the same
+    criteria as in check_hit_kernel.
+
+    Parameters
+    ----------
+    source, N, r, n, is_3d
+        See check_hit_kernel.
+    source_ref : np.array
+        Position of the X-ray source, in the phantom reference position that
+        the BVH was built for.
+    N_ref : np.array
+        Beam face normals, in the phantom reference position that the BVH was
+        built for.
+    order, node_min, node_max, node_children, node_range
+        The BVH, see build_bvh.
+
+    Returns
+    -------
+    np.array
+        A boolean array of the same length as the number of skin cells. True
+        for all entrance skin cells that are hit by the beam.
+
+    """
+    hits = np.zeros(r.shape[0], dtype=np.bool_)
+
+    # Depth first traversal, starting at the root node
+    stack = np.empty(node_range.shape[0], dtype=np.int64)
+    stack[0] = 0
+    top = 1
+
+    while top > 0:
+        top -= 1
+        node = stack[top]
+
+        if _outside_beam(source_ref, N_ref, node_min[node], node_max[node]):
+            continue
+
+        if node_children[node, 0] < 0:
+            for ind in range(node_range[node, 0], node_range[node, 1]):
+                cell = order[ind]
+                hits[cell] = _cell_hit(source, N, r, n, is_3d, cell)
+        else:
+            stack[top] = node_children[node, 0]
+            stack[top + 1] = node_children[node, 1]
+            top += 2
+
+    return hits
+
+
+def check_hit_batch(sources: np.array, N: np.array, r: np.array,
+                    n: np.array, is_3d: bool, gpu: bool = False) -> np.array:
+    """Calculate which skin cells are hit by the beam for several events.
+
+    Vectorized version of check_hit_kernel, where the skin cells of a static
+    phantom are tested against the beams of several irradiation events at
+    once. Optionally, the calculation is run on the GPU with CuPy.
+
+    All beams must be given in the same coordinate frame as the skin cells,
+    i.e., the phantom must be in the same position (same table geometry) for
+    all events. Beams of events with other table positions can be mapped into
+    the frame of r with the rigid transform stored in Phantom.position.
+
+    Each event requires temporary arrays of about 70 bytes per skin cell,
+    e.g. about 6 MB for a phantom with 80 000 skin cells. The events are
+    therefore processed in chunks, so that the largest temporary array holds
+    at most BATCH_MAX_ARRAY_SIZE elements. Only the e*n boolean output grows
+    with the number of events.
+
+    Parameters
+    ----------
+    sources : np.array
+        e*3 array, where each row contains the (x,y,z) coordinates to the
+        X-ray source of one of the e irradiation events
+    N : np.array
+        e*4*3 array, containing the four beam face normals (see Beam.N) for
+        each of the e irradiation events
+    r : np.array
+        n*3 array, where each row contains the xyz coordinate of one of the
+        phantom skin cells
+    n : np.array
+        n*3 array of normal vectors to each of the phantom skin cells. Only
+        used if is_3d is True.
+    is_3d : bool
+        If True, skin cells on the beams exit path are excluded.
+    gpu : bool, optional
+        If True, the calculation is run on the GPU, which requires CuPy (the
+        default is False).
+
+    Returns
+    -------
+    np.array
+        e*n boolean array, where row e is True for all entrance skin cells
+        that are hit by the beam in irradiation event e.
+
+    Raises
+    ------
+    ImportError
+        Raises import error if gpu=True is selected without CuPy installed.
+
+    """
+    if not gpu:
+        return _check_hit_batch(np, sources, N, r, n, is_3d)
+
+    # CuPy is imported here, so that it is only loaded when actually used
+    try:
+        import cupy
+    except ImportError:
+        raise ImportError("CuPy is required for hit calculations on GPU")
+
+    return _check_hit_batch(cupy, sources, N, r, n, is_3d)
+
+
+def _check_hit_batch(xp, sources: np.array, N: np.array, r: np.array,
+                     n: np.array, is_3d: bool) -> np.array:
+    """Run check_hit_batch with the NumPy compatible array module xp.
+
+    The input is copied to the device of xp once for all events, and the
+    result is copied back to host memory. Both copies are no-ops for NumPy.
+
+    """
+    sources, N, r, n = (xp.asarray(arr) for arr in (sources, N, r, n))
+
+    hits = xp.zeros((len(sources), len(r)), dtype=bool)
+    chunk_size = max(1, BATCH_MAX_ARRAY_SIZE // (4 * max(1, len(r))))
+
+    for start in range(0, len(sources), chunk_size):
+        end = start + chunk_size
+
+        # Vectors from each X-ray source to each phantom skin cell
+        v = r[xp.newaxis, :, :] - sources[start:end, xp.newaxis, :]
+
+        # Check which skin cells lies within the beam for each event
+        chunk_hits = (xp.einsum('epk,eik->epi', v, N[start:end]) <= 0).all(
+            axis=2)
+
+        # Remove exit path skin cells
+        if is_3d:
+            chunk_hits &= xp.einsum('epk,pk->ep', v, n) <= 0
+
+        hits[start:end] = chunk_hits
+
+    # CuPy arrays are copied to host memory with asnumpy
+    return getattr(xp, 'asnumpy', np.asarray)(hits)
@@ -1,6 +1,9 @@
+import math
+
 import numpy as np
 import pandas as pd
 from typing import List
+from ._kernels import check_hit_batch, check_hit_bvh, check_hit_kernel
 from .phantom_class import Phantom
 
 
@@ -24,8 +27,8 @@ class Beam:
     det_ijk : np.array
         same as ijk, but for plotting the X-ray detector
     N : np.array
-        4*3 array, where each row contains a normal vector to one of the four
-        faces of the beam.
+        4*3 array, where each row contains a (non-unit) normal vector to one
+        of the four faces of the beam.
 
     Methods
     -------
@@ -33,6 +36,10 @@ class Beam:
         Calculates which of the patient phantom's entrance skin cells are hit
         by the X-ray beam. For 3D phantoms, skin cells on the beams exit path
         are neglected.
+    check_hit_batch(patient, beams, rotations, translations, gpu)
+        Same as check_hit, but for several beams at once. Each beam is tested
+        against the phantom in its reference position, mapped with the
+        phantom transformation of the beam's event.
 
     """
 
@@ -64,23 +71,33 @@ class Beam:
             # Fetch rotation angles of the X-ray tube
 
             # Positioner isocenter primary angle (Ap1)
-            ap1 = np.deg2rad(data_norm.Ap1[event])
+            ap1 = math.radians(data_norm.Ap1[event])
             # Positioner isocenter secondary angle (Ap2)
-            ap2 = np.deg2rad(data_norm.Ap2[event])
+            ap2 = math.radians(data_norm.Ap2[event])
             # Positioner isocenter detector rotation angle (Ap3)
-            ap3 = np.deg2rad(data_norm.Ap3[event])
-
-        R1 = np.array([[+np.cos(ap1), np.sin(ap1), +0],
-                      [-np.sin(ap1), +np.cos(ap1), +0],
-                      [+0, +0, +1]])
-
-        R2 = np.array([[+1, +0, +0],
-                       [+0, +np.cos(ap2), +np.sin(ap2)],
-                       [+0, -np.sin(ap2), +np.cos(ap2)]])
-
-        R3 = np.array([[+np.cos(ap3), +0, -np.sin(ap3)],
-                       [+0, +1, +0],
-                       [+np.sin(ap3), +0, +np.cos(ap3)]])
+            ap3 = math.radians(data_norm.Ap3[event])
+
+        # Evaluate each scalar cosine and sine only once
+        c1, s1 = math.cos(ap1), math.sin(ap1)
+        c2, s2 = math.cos(ap2), math.sin(ap2)
+        c3, s3 = math.cos(ap3), math.sin(ap3)
+
+        # With the rotations about ap1, ap2 and ap3 given by
+        # R1 = [[+c1, +s1, +0], [-s1, +c1, +0], [+0, +0, +1]],
+        # R2 = [[+1, +0, +0], [+0, +c2, +s2], [+0, -s2, +c2]] and
+        # R3 = [[+c3, +0, -s3], [+0, +1, +0], [+s3, +0, +c3]],
+        # the detector is rotated by M = (R2 * R1)^T, and the beam by
+        # M_beam = M * R3^T. Both are filled in directly from the cosines and
+        # sines, instead of multiplying the individual rotation matrices.
+        M = np.array([[+c1, -s1 * c2, +s1 * s2],
+                      [+s1, +c1 * c2, -c1 * s2],
+                      [+0, +s2, +c2]])
+
+        M_beam = np.array([[c1 * c3 - s1 * s2 * s3, -s1 * c2,
+                            c1 * s3 + s1 * s2 * c3],
+                           [s1 * c3 + c1 * s2 * s3, +c1 * c2,
+                            s1 * s3 - c1 * s2 * c3],
+                           [-c2 * s3, +s2, +c2 * c3]])
 
         # Locate X-ray source
         source = np.array([0, data_norm.DSI[event], 0])
@@ -98,7 +115,7 @@ class Beam:
         r = np.vstack([source, r])
 
         # Rotate beam about ap1, ap2 and ap3
-        r = np.matmul(np.matmul(R2, R1).T, np.matmul(R3.T, r.T)).T
+        r = np.matmul(M_beam, r.T).T
 
         self.r = r
 
@@ -108,11 +125,12 @@ class Beam:
             [1, 1, 3, 3, 2, 3],
             [2, 4, 2, 4, 3, 4]))
 
-        # Create unit vectors from X-ray source to beam verticies
-        v = ((self.r[1:] - self.r[0, :]).T /
-             np.linalg.norm(self.r[1:] - self.r[0, :], axis=1)).T
+        # Create vectors from X-ray source to beam verticies
+        v = self.r[1:] - self.r[0, :]
 
-        # Create the four normal vectors to the faces of the beam.
+        # Create the four normal vectors to the faces of the beam. These are
+        # not of unit length, since only the sign of the dot product with the
+        # normals is used when checking which skin cells are hit.
         self.N = np.vstack([np.cross(v[0, :], v[1, :]),
                             np.cross(v[1, :], v[2, :]),
                             np.cross(v[2, :], v[3, :]),
@@ -138,7 +156,7 @@ class Beam:
         det_r[:, 1] *= data_norm.DID[event]
 
         # Rotate detector about ap1, ap2 and ap3
-        det_r = np.matmul(np.matmul(R2, R1).T, det_r.T).T
+        det_r = np.matmul(M, det_r.T).T
         self.det_r = det_r
 
         # Manually construct vertex index vector for the X-ray detector
@@ -147,7 +165,7 @@ class Beam:
             [1, 2, 5, 6, 1, 5, 3, 7, 2, 2, 2, 6],
             [2, 3, 6, 7, 4, 4, 4, 4, 7, 6, 6, 5]))
 
-    def check_hit(self, patient: Phantom) -> List[bool]:
+    def check_hit(self, patient: Phantom) -> np.ndarray:
         """Calculate which patient entrance skin cells are hit by the beam.
 
         A description of this algoritm is presented in the wiki, please visit
@@ -161,24 +179,89 @@ class Beam:
 
         Returns
         -------
-        List[bool]
-            A boolean list of the same length as the number of patient skin
+        np.ndarray
+            A boolean array of the same length as the number of patient skin
             cells. True for all entrance skin cells that are hit by the beam.
 
         """
-        # Create vectors from X-ray source to each phantom skin cell
-        v = patient.r - self.r[0, :]
-
-        # Check which skin cells lies within the beam
-        hits = (np.dot(v, self.N.T) <= 0).all(axis=1)
-        # if patient phantom is 3D, remove exit path skin cells
-        if patient.phantom_model != "plane":
-            temp1 = v[hits]
-            temp2 = patient.n[hits]
+        # if patient phantom is 3D, exit path skin cells are removed
+        is_3d = patient.phantom_model != "plane"
+        n = patient.n if is_3d else np.empty((0, 3))
+
+        if patient.bvh is None:
+            return check_hit_kernel(self.r[0, :], self.N, patient.r, n, is_3d)
+
+        # Express the beam in the phantom reference position, in order to
+        # cull skin cells outside the beam with the phantom BVH.
+        source_ref = np.matmul(patient.rotation.T,
+                               self.r[0, :] - patient.translation)
+        N_ref = np.matmul(self.N, patient.rotation)
+
+        return check_hit_bvh(self.r[0, :], self.N, patient.r, n, is_3d,
+                             source_ref, N_ref, *patient.bvh)
+
+    @staticmethod
+    def check_hit_batch(patient: Phantom, beams: List["Beam"],
+                        rotations: np.array, translations: np.array,
+                        gpu: bool = False) -> np.ndarray:
+        """Calculate which patient entrance skin cells are hit by each beam.
+
+        The beams may belong to irradiation events with different patient
+        positions. Each beam is mapped into the phantom reference position
+        r_ref with the inverse of the phantom transformation of its event (see
+        Phantom.transform), so that all beams can be tested against the same
+        skin cells in vectorized operations, see _kernels.check_hit_batch for
+        the memory use. The patient phantom is not repositioned.
 
-            bool_entrance = [np.dot(temp1[i], temp2[i]) <= 0
-                             for i in range(len(temp1))]
+        Parameters
+        ----------
+        patient : Phantom
+            Patient phantom, either of type plane, cylinder or human, i.e.
+            instance of class Phantom, with a saved reference position.
+        beams : List[Beam]
+            X-ray beams, i.e., instances of class Beam.
+        rotations : np.array
+            e*3*3 array with the phantom rotation of each beam's event.
+        translations : np.array
+            e*3 array with the phantom translation of each beam's event.
+        gpu : bool, optional
+            If True, the calculation is run on the GPU, which requires CuPy
+            (the default is False).
 
-            hits[np.where(hits)] = bool_entrance
+        Returns
+        -------
+        np.ndarray
+            A boolean array of shape (number of beams, number of skin cells).
+            Row e is True for all entrance skin cells that are hit by beam e,
+            as given by check_hit with the phantom positioned for that event.
 
-        return hits.tolist()
+        """
+        is_3d = patient.phantom_model != "plane"
+        rotations = np.asarray(rotations)
+        translations = np.asarray(translations)
+
+        # Express the beams in the phantom reference position, i.e.
+        # source_ref = R^T (source - t) and N_ref = N R
+        sources = np.stack([beam.r[0, :] for beam in beams])
+        sources_ref = np.einsum(
+            'eji,ej->ei', rotations, sources - translations)
+        N_ref = np.matmul(np.stack([beam.N for beam in beams]), rotations)
+
+        hits = np.zeros((len(beams), len(patient.r_ref)), dtype=bool)
+
+        # The skin cell normals are not moved by Phantom.position, so their
+        # reference position equivalent depends on the table rotation. Each
+        # group of events with the same table rotation is tested at once.
+        unique_rotations, group = np.unique(
+            rotations.reshape(-1, 9), axis=0, return_inverse=True)
+        group = group.ravel()
+
+        for ind, R in enumerate(unique_rotations.reshape(-1, 3, 3)):
+            events = group == ind
+            n_ref = np.matmul(patient.n, R) if is_3d else np.empty((0, 3))
+
+            hits[events] = check_hit_batch(
+                sources_ref[events], N_ref[events], patient.r_ref, n_ref,
+                is_3d, gpu=gpu)
+
+        return hits
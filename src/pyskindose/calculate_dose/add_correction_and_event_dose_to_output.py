@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 def add_corrections_and_event_dose_to_output(
         normalized_data: pd.DataFrame,
         event: int,
-        hits: List[bool],
+        hits: np.ndarray,
         table_hits: List[bool],
         patient: Phantom,
         back_scatter_interpolation: List[CubicSpline],
@@ -29,8 +29,8 @@ def add_corrections_and_event_dose_to_output(
         RDSR data, normalized for compliance with PySkinDose.
     event : int
         Irradiation event index.
-    hits : List[bool]
-        A boolean list of the same length as the number of patient skin
+    hits : np.ndarray
+        A boolean array of the same length as the number of patient skin
         cells. True for all entrance skin cells that are hit by the beam for a
         specific irradiation event.
     table_hits : List[bool]
@@ -59,7 +59,7 @@ def add_corrections_and_event_dose_to_output(
 
     """
     event_dose = np.zeros(len(patient.r))
-    if not sum(hits):
+    if not hits.any():
         output[c.OUTPUT_KEY_DOSE_MAP] += event_dose
         return output
 
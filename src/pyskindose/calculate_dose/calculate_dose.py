@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Dict, Optional, Tuple
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Tuple
 from tqdm import tqdm
 import numpy as np
 import pandas as pd
@@ -8,6 +9,7 @@ from pyskindose.calculate_dose.calculate_irradiation_event_result import (
     calculate_irradiation_event_result,
 )
 from pyskindose import constants as c
+from pyskindose.beam_class import Beam
 from pyskindose.corrections import calculate_k_bs, calculate_k_tab
 from pyskindose.geom_calc import (
     check_new_geometry,
@@ -75,6 +77,11 @@ def calculate_dose(
     # geometry parameters since the previous irradiation event
     new_geometry = check_new_geometry(normalized_data)
 
+    logger.debug("Checking which skin cells are hit by the beam")
+    new_geometry_hits = calculate_new_geometry_hits(
+        normalized_data=normalized_data, new_geometry=new_geometry,
+        patient=patient, gpu=settings.gpu)
+
     # fetch of k_bs interpolation object (k_bs=f(field_size))for all events
     back_scatter_interpolation = calculate_k_bs(data_norm=normalized_data)
 
@@ -96,11 +103,14 @@ def calculate_dose(
         c.OUTPUT_KEY_DOSE_MAP: np.zeros(len(patient.r)),
     }
 
+    start = perf_counter_ns()
+
     output = calculate_irradiation_event_result(
         normalized_data=normalized_data,
         event=0,
         total_events=len(normalized_data),
         new_geometry=new_geometry,
+        new_geometry_hits=new_geometry_hits,
         k_tab=k_tab,
         hits=[],
         patient=patient,
@@ -111,4 +121,55 @@ def calculate_dose(
         pbar=tqdm(total=total_number_of_events, desc='calculating dose')
     )
 
+    logger.debug(
+        "Calculated skin dose for %d irradiation events in %.3f s",
+        total_number_of_events, (perf_counter_ns() - start) * 1e-9)
+
     return patient, output
+
+
+def calculate_new_geometry_hits(
+    normalized_data: pd.DataFrame,
+    new_geometry: List[bool],
+    patient: Phantom,
+    gpu: bool = False,
+) -> Dict[int, np.ndarray]:
+    """Calculate which skin cells are hit, for all events with new geometry.
+
+    The beams of all events are tested at once against the patient phantom in
+    its reference position, see Beam.check_hit_batch.
+
+    Parameters
+    ----------
+    normalized_data : pd.DataFrame
+        RDSR data, normalized for compliance with PySkinDose.
+    new_geometry : List[bool]
+        A boolean list that specifies whether the irradiation geometry has
+        changes since the preceding event. See the function check_new_geometry
+    patient : Phantom
+        Patient skin surface phantom, with a saved reference position.
+    gpu : bool, optional
+        If True, the hits are calculated on the GPU, which requires CuPy (the
+        default is False).
+
+    Returns
+    -------
+    Dict[int, np.ndarray]
+        Boolean hit/miss status of each skin cell, for each event index with
+        new geometry.
+
+    """
+    events = [event for event, new in enumerate(new_geometry) if new]
+
+    beams = [Beam(data_norm=normalized_data, event=event, plot_setup=False)
+             for event in events]
+
+    rotations, translations = zip(*[
+        patient.transform(data_norm=normalized_data, event=event)
+        for event in events])
+
+    hits = Beam.check_hit_batch(
+        patient=patient, beams=beams, rotations=np.stack(rotations),
+        translations=np.stack(translations), gpu=gpu)
+
+    return dict(zip(events, hits))
@@ -21,8 +21,9 @@ def calculate_irradiation_event_result(
     event: int,
     total_events: int,
     new_geometry: List[bool],
+    new_geometry_hits: Dict[int, np.ndarray],
     k_tab: List[float],
-    hits: List[bool],
+    hits: np.ndarray,
     patient: Phantom,
     table: Phantom,
     pad: Phantom,
@@ -49,10 +50,13 @@ def calculate_irradiation_event_result(
     new_geometry : List[bool]
         A boolean list that specifies whether the irradiation geometry has
         changes since the preceding event. See the function check_new_geometry
+    new_geometry_hits : Dict[int, np.ndarray]
+        Hit/miss status of each skin cell, for each event with new geometry,
+        see calculate_new_geometry_hits in calculate_dose.py
     k_tab : List[float]
         List of table correction factors
-    hits : List[bool]
-        A boolean list that specifies (for a single event) the hit/miss status
+    hits : np.ndarray
+        A boolean array that specifies (for a single event) the hit/miss status
         of each skin cell upon the patient phantom.
     patient : Phantom
         Patient skin surface phantom
@@ -83,14 +87,16 @@ def calculate_irradiation_event_result(
         Dictionary containing skin dose calculation results.
 
     """
+    # Lazy formatting, since this is called once for each irradiation event
     logger.debug(
-        f"Calculating irradiation event {event + 1} out of {total_events}")
+        "Calculating irradiation event %d out of %d", event + 1, total_events)
 
     hits, table_hits, field_area, k_isq = \
         perform_calculations_for_new_geometries(
             normalized_data=normalized_data,
             event=event,
             new_geometry=new_geometry[event],
+            new_geometry_hits=new_geometry_hits,
             patient=patient,
             table=table,
             pad=pad,
@@ -129,6 +135,7 @@ def calculate_irradiation_event_result(
             event=event,
             total_events=total_events,
             new_geometry=new_geometry,
+            new_geometry_hits=new_geometry_hits,
             k_tab=k_tab,
             hits=hits,
             patient=patient,
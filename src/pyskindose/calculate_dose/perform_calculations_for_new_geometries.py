@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 import logging
 
 import numpy as np
@@ -12,9 +12,10 @@ logger = logging.getLogger(__name__)
 def perform_calculations_for_new_geometries(
         normalized_data: pd.DataFrame,
         event: int, new_geometry: bool,
+        new_geometry_hits: Dict[int, np.ndarray],
         patient: Phantom, table: Phantom,
         pad: Phantom,
-        hits: List[bool],
+        hits: np.ndarray,
         table_hits: List[bool],
         field_area: List[float],
         k_isq: np.array):
@@ -27,10 +28,10 @@ def perform_calculations_for_new_geometries(
     table.position(data_norm=normalized_data, event=event)
     pad.position(data_norm=normalized_data, event=event)
 
-    logger.debug("Checking which skin cells are hit by the beam")
-    hits = beam.check_hit(patient=patient)
+    # The hits of all new geometries are calculated at once in calculate_dose
+    hits = new_geometry_hits[event]
 
-    if sum(hits):
+    if hits.any():
         logger.debug("Checking which hit skin cells need table correction")
         table_hits = check_table_hits(source=beam.r[0, :],
                                       table=table,
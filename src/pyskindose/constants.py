@@ -1,3 +1,10 @@
+import sys
+
+try:
+    from typing import Final
+except ImportError:  # Python < 3.8
+    from typing_extensions import Final
+
 COLOR_CANVAS_DARK = 'rgb(33,33,33)'
 COLOR_CANVAS_LIGHT = 'rgb(252, 252, 252)'
 COLOR_PLOT_TEXT_LIGHT = 'rgb(52, 49, 49)'
@@ -26,12 +33,15 @@ COLOR_WIRE_FRAME_TABLE = '#3f3f3f'
 
 DATA_DS_IRP = "DSIRP"
 
-KEY_PARAM_MODE = 'mode'
-KEY_PARAM_RDSR_FILENAME = 'rdsr_filename'
-KEY_PARAM_ESTIMATE_K_TAB = 'estimate_k_tab'
-KEY_PARAM_K_TAB_VAL = 'k_tab_val'
-KEY_PARAM_PHANTOM_MODEL = 'model'
-KEY_PARAM_HUMAN_MESH = 'human_mesh'
+# Settings keys. Final marks them as constants for type checkers, and
+# sys.intern guarantees a single canonical string object per key.
+KEY_PARAM_MODE: Final[str] = sys.intern('mode')
+KEY_PARAM_RDSR_FILENAME: Final[str] = sys.intern('rdsr_filename')
+KEY_PARAM_ESTIMATE_K_TAB: Final[str] = sys.intern('estimate_k_tab')
+KEY_PARAM_K_TAB_VAL: Final[str] = sys.intern('k_tab_val')
+KEY_PARAM_PHANTOM_MODEL: Final[str] = sys.intern('model')
+KEY_PARAM_HUMAN_MESH: Final[str] = sys.intern('human_mesh')
+KEY_PARAM_GPU: Final[str] = sys.intern('gpu')
 
 DIMENSION_PLANE_LENGTH = "plane_length"
 DIMENSION_PLANE_RESOLUTION = "plane_resolution"
@@ -170,9 +180,9 @@ PLOT_MARGIN_NOTEBOOK = dict(l=5, r=5, b=5, t=40)
 PLOT_MARGIN = dict(l=0, r=0, b=100, t=40)
 
 
-OFFSET_LATERAL_KEY = 'd_lat'
-OFFSET_VERTICAL_KEY = 'd_ver'
-OFFSET_LONGITUDINAL_KEY = 'd_lon'
+OFFSET_LATERAL_KEY: Final[str] = sys.intern('d_lat')
+OFFSET_VERTICAL_KEY: Final[str] = sys.intern('d_ver')
+OFFSET_LONGITUDINAL_KEY: Final[str] = sys.intern('d_lon')
 
 RESOLUTION_SPARSE = "sparse"
 RESOLUTION_DENSE = "dense"
@@ -183,6 +193,7 @@ TABULATED_FIELD_SIDE_LENGTHS_IN_CM = [5, 10, 20, 25, 35]
 # Offset needed to show plane phantom correctly
 VISUAL_OFFSET_PHANTOM_MODEL_PLANE = -0.01
 MODE_NOTEBOOK_MODE = 'notebook_mode'
+MODE_INTERACTIVITY = 'interactivity'
 
 PLOT_HEIGHT_KEY = 'height'
 PLOT_WIDTH_KEY = 'width'
@@ -191,6 +202,9 @@ DOSEMAP_COLORSCALE_KEY = 'colorscale'
 # Available colorscales are documented here:
 # https://plotly.com/python/builtin-colorscales/
 DOSEMAP_COLORSCALE = 'jet'
+# Number of decimals of the cell positions (cm) and skin doses (mGy) that are
+# sent to plotly when plotting dose maps
+DOSEMAP_DECIMALS = 2
 # amp
 
 PATIENT_ORIENTATION_HEAD_FIRST_SUPINE = 'head_first_supine'
@@ -10,12 +10,16 @@ DEVELOPMENT_PARAMETERS = dict(
     estimate_k_tab=False,
     # Numeric value of estimated table correction
     k_tab_val=0.8,
+    # Set True to run the skin cell hit calculations on GPU (requires CuPy)
+    gpu=False,
     # plot settings
     plot={
         # dark mode for plots
         c.MODE_DARK_MODE: True,
         # notebook mode
         c.MODE_NOTEBOOK_MODE: False,
+        # show hover info (cell position and skin dose) in dose maps
+        c.MODE_INTERACTIVITY: True,
         # choose if dosemap should be plotted after dose calculations.
         c.MODE_PLOT_DOSEMAP: False,
         # colorscale for dosemaps
@@ -148,7 +148,7 @@ def vector(start: np.array, stop: np.array, normalization=False) -> np.array:
 
 
 def scale_field_area(data_norm: pd.DataFrame, event: int, patient: Phantom,
-                     hits: List[bool], source: np.array) -> List[float]:
+                     hits: np.ndarray, source: np.array) -> List[float]:
     """Scale X-ray field area from image detector, to phantom skin cells.
 
     This function scales the X-ray field size from the point where it is stated
@@ -166,8 +166,8 @@ def scale_field_area(data_norm: pd.DataFrame, event: int, patient: Phantom,
         Irradiation event index.
     patient : Phantom
         Patient phantom, i.e. instance of class Phantom.
-    hits : List[bool]
-        A boolean list of the same length as the number of patient skin
+    hits : np.ndarray
+        A boolean array of the same length as the number of patient skin
         cells. True for all entrance skin cells that are hit by the beam for a
         specific irradiation event.
     source : np.array
@@ -56,10 +56,7 @@ def _parse_settings_to_settings_class(settings: Optional[str] = None):
 
     if settings is not None:
 
-        if isinstance(settings, PyskindoseSettings):
-            return settings
-
-        return PyskindoseSettings(settings)
+        return PyskindoseSettings.from_source(settings)
 
     settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
 
@@ -72,7 +69,7 @@ def _parse_settings_to_settings_class(settings: Optional[str] = None):
     with open(settings_path, "r") as fp:
         output = fp.read()
 
-    return PyskindoseSettings(output)
+    return PyskindoseSettings.from_json(output)
 
 
 def _read_and_normalise_rdsr_data(
@@ -5,10 +5,12 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from stl import mesh
-from typing import Dict, List, Optional
+from typing import List, Optional, Tuple
 
+from ._kernels import build_bvh
 from .constants import (
     DOSEMAP_COLORSCALE,
+    DOSEMAP_DECIMALS,
     PLOT_ASPECTMODE_PLOT_DOSEMAP,
     PLOT_FONT_FAMILY,
     PLOT_FONT_SIZE,
@@ -26,6 +28,8 @@ from .settings_pyskindose import PhantomDimensions
 
 # valid phantom types
 VALID_PHANTOM_MODELS = ["plane", "cylinder", "human", "table", "pad"]
+# phantom types that represent the patient skin surface
+PATIENT_PHANTOM_MODELS = ["plane", "cylinder", "human"]
 
 
 class Phantom:
@@ -51,12 +55,22 @@ class Phantom:
         An empty 1d array to store skin dose calculation for each of the n
         phantom cells. Only for patient phantom types (plane, cylinder, human)
     n : np.array
-        normal vectors to each of the n phantom skin cells. (only for 3D
+        unit normal vectors to each of the n phantom skin cells. (only for 3D
         patient phantoms, i.e. "cylinder" and "human")
     r_ref : np.array
         Empty array to store of reference position of the phantom cells after
         the phantom has been aligned in the geometry with the position_geometry
         function in geom_calc.py
+    rotation : np.array
+        3*3 rotation matrix of the current phantom position, relative to the
+        reference position r_ref, i.e. r = r_ref * rotation^T + translation.
+    translation : np.array
+        Translation of the current phantom position, relative to the reference
+        position r_ref, see rotation.
+    bvh : Optional[Tuple[np.array]]
+        Bounding volume hierarchy of the skin cells in the reference position,
+        used to speed up the beam hit check. Only for patient phantom types,
+        and only available after save_position has been called.
     table_length : float
         length of patient support table. The is needed for all phantom object
         to select correct rotation origin for At1, At2, and At3.
@@ -113,6 +127,9 @@ class Phantom:
                              f"{'.'.join(VALID_PHANTOM_MODELS)}")
 
         self.r_ref: np.array
+        self.rotation: np.array
+        self.translation: np.array
+        self.bvh: Optional[Tuple[np.array]] = None
 
         # Save table length for all phantom in order to choose correct rotation
         # origin when applying At1, At2, and At3
@@ -141,22 +158,22 @@ class Phantom:
 
             t = phantom_dim.plane_width
 
-            # Create index vectors for plotly mesh3d plotting
-            i2: List[int] = []
-            i1 = j1 = k1 = i2
-
-            for i in range(len(x) - 1):
-                for j in range(len(y) - 1):
-                    i1 = i1 + [j * len(x) + i]
-                    j1 = j1 + [j * len(x) + i + 1]
-                    k1 = k1 + [j * len(x) + i + len(x)]
-                    i2 = i2 + [j * len(x) + i + len(x) + 1]
+            # Create index vectors for plotly mesh3d plotting, with the
+            # longitudinal grid index i as the outer and j as the inner index.
+            i, j = np.meshgrid(np.arange(len(x) - 1), np.arange(len(y) - 1),
+                               indexing='ij')
+            i1 = (j * len(x) + i).ravel()
+            j1 = i1 + 1
+            k1 = i1 + len(x)
+            i2 = i1 + len(x) + 1
 
             self.r = np.column_stack((x_plane.ravel(),
                                       y_plane.ravel(),
                                       np.zeros(len(x_plane.ravel()))))
 
-            self.ijk = np.column_stack((i1 + i2, j1 + k1, k1 + j1))
+            self.ijk = np.column_stack((np.concatenate((i1, i2)),
+                                        np.concatenate((j1, k1)),
+                                        np.concatenate((k1, j1))))
             self.dose = np.zeros(len(self.r))
 
         # creates a cylinder phantom (elliptic)
@@ -174,8 +191,8 @@ class Phantom:
             # Creates linearly spaced points along an ellipse
             #  in the lateral direction
             t = np.arange(0 * np.pi, 2 * np.pi, res_width)
-            x = (phantom_dim.cylinder_radii_a * np.cos(t)).tolist()
-            z = (phantom_dim.cylinder_radii_b * np.sin(t)).tolist()
+            x = phantom_dim.cylinder_radii_a * np.cos(t)
+            z = phantom_dim.cylinder_radii_b * np.sin(t)
 
             # calculate normal vectors of a cylinder (pointing outwards)
             nx = np.cos(t) / (
@@ -186,37 +203,30 @@ class Phantom:
             nz = 2 * np.sin(t) / (
                 np.sqrt(np.square(np.cos(t) + 4 * np.square(np.sin(t)))))
 
-            nx = nx.tolist()
-            ny = ny.tolist()
-            nz = nz.tolist()
+            n = np.column_stack((nx, ny, nz))
 
-            n = [[nx[ind], ny[ind], nz[ind]] for ind in range(len(t))]
-
-            # Store the  coordinates of the cylinder phantom
-            output: Dict = dict(n=[], x=[], y=[], z=[])
+            # Number of ellipses along the length of the phantom
+            num_ellipses = int(res_length) * (phantom_dim.cylinder_length + 2)
 
             # Extend the ellipse to span the entire length of the phantom,
             # thus creating an elliptic cylinder
-            for index in range(
-                    0, int(res_length) * (phantom_dim.cylinder_length + 2), 1):
+            y = 1 / res_length * np.arange(num_ellipses)
 
-                output["x"] = output["x"] + x
-                output["y"] = output["y"] + [1 / res_length * index] * len(x)
-                output["z"] = output["z"] + z
-                output["n"] = output["n"] + n
+            self.r = np.column_stack((np.tile(x, num_ellipses),
+                                      np.repeat(y, len(t)),
+                                      np.tile(z, num_ellipses)))
 
             # Create index vectors for plotly mesh3d plotting
-            i1 = list(range(0, len(output["x"]) - len(t)))
-            j1 = list(range(1, len(output["x"]) - len(t) + 1))
-            k1 = list(range(len(t), len(output["x"])))
-            i2 = list(range(0, len(output["x"]) - len(t)))
-            k2 = list(range(len(t) - 1, len(output["x"]) - 1))
-            j2 = list(range(len(t), len(output["x"])))
-
-            self.r = np.column_stack((output["x"], output["y"], output["z"]))
+            i1 = list(range(0, len(self.r) - len(t)))
+            j1 = list(range(1, len(self.r) - len(t) + 1))
+            k1 = list(range(len(t), len(self.r)))
+            i2 = list(range(0, len(self.r) - len(t)))
+            k2 = list(range(len(t) - 1, len(self.r) - 1))
+            j2 = list(range(len(t), len(self.r)))
+
             self.ijk = np.column_stack((i1 + i2, j1 + j2, k1 + k2))
             self.dose = np.zeros(len(self.r))
-            self.n = np.asarray(output["n"])
+            self.n = np.tile(n, (num_ellipses, 1))
 
         # creates a human phantom
         elif phantom_model == "human":
@@ -233,8 +243,9 @@ class Phantom:
             r = phantom_mesh.vectors
             n = phantom_mesh.normals
 
-            self.r = np.asarray([el for el_list in r for el in el_list])
-            self.n = np.asarray([x for pair in zip(n, n, n) for x in pair])
+            # One skin cell per triangle vertex, each with the triangle normal
+            self.r = r.reshape(-1, 3)
+            self.n = np.repeat(n, 3, axis=0)
 
             # Create index vectors for plotly mesh3d plotting
             self.ijk = np.column_stack((
@@ -311,6 +322,13 @@ class Phantom:
             self.r = np.column_stack((x_pad, y_pad, z_pad))
             self.ijk = np.column_stack((i_pad, j_pad, k_pad))
 
+        # Normalize the skin cell normals once, and store them contiguously
+        # for the beam hit check.
+        if self.phantom_model in ["cylinder", "human"]:
+            norm = np.linalg.norm(self.n, axis=1)
+            norm[norm == 0] = 1
+            self.n = np.ascontiguousarray(self.n / norm[:, np.newaxis])
+
     def rotate(self, angles: List[int]) -> None:
         """Rotate the phantom about the angles specified in rotation.
 
@@ -341,13 +359,16 @@ class Phantom:
                        [+np.sin(z_rot), +np.cos(z_rot), +0],
                        [+0, +0, +1]])
 
-        # Rotate position vectors to the phantom cells
-
-        self.r = np.matmul(Rx, np.matmul(Ry, np.matmul(Rz, self.r.T))).T
+        # Rotate position vectors to the phantom cells. The result is stored
+        # row-major, since the beam hit check iterates over the rows.
+        self.bvh = None
+        self.r = np.ascontiguousarray(
+            np.matmul(Rx, np.matmul(Ry, np.matmul(Rz, self.r.T))).T)
 
         if self.phantom_model in ["cylinder", "human"]:
 
-            self.n = np.matmul(Rx, np.matmul(Ry, np.matmul(Rz, self.n.T))).T
+            self.n = np.ascontiguousarray(
+                np.matmul(Rx, np.matmul(Ry, np.matmul(Rz, self.n.T))).T)
 
     def translate(self, dr: List[int]) -> None:
         """Translate the phantom in the x, y or z direction.
@@ -360,6 +381,7 @@ class Phantom:
             dr = [0, 0, 10] will translate the phantom 10 cm in the z direction
 
         """
+        self.bvh = None
         self.r[:, 0] += dr[0]
         self.r[:, 1] += dr[1]
         self.r[:, 2] += dr[2]
@@ -374,6 +396,13 @@ class Phantom:
         r_ref = copy.copy(self.r)
         self.r_ref = r_ref
 
+        # The current position equals the reference position
+        self.rotation = np.eye(3)
+        self.translation = np.zeros(3)
+
+        if self.phantom_model in PATIENT_PHANTOM_MODELS:
+            self.bvh = build_bvh(self.r_ref)
+
     def position(self, data_norm: pd.DataFrame, event: int) -> None:
         """Position the phantom for a event by adding RDSR table displacement.
 
@@ -394,7 +423,60 @@ class Phantom:
         # position phantom centered about isocenter
         self.r[:, 2] += self.table_length / 2
 
-        # Fetch At1, At2, and At3
+        # Apply table rotation
+        R = self._table_rotation(data_norm=data_norm, event=event)
+        self.r = np.matmul(R, (self.r).T).T
+
+        # Replace phantom to stanting position
+        self.r[:, 2] -= self.table_length/2
+
+        # Apply phantom translation
+        t = np.array(
+            [data_norm.Tx[event], data_norm.Ty[event], data_norm.Tz[event]]
+            )
+
+        self.r = np.ascontiguousarray(self.r + t)
+
+        # Save the rigid transformation from the reference position
+        self.rotation, self.translation = self.transform(
+            data_norm=data_norm, event=event)
+
+    def transform(self, data_norm: pd.DataFrame,
+                  event: int) -> Tuple[np.array, np.array]:
+        """Get the rigid transformation of the phantom for an event.
+
+        The transformation maps the reference position r_ref to the position
+        set by the function position, without repositioning the phantom.
+
+        Parameters
+        ----------
+        data_norm : pd.DataFrame
+            Table containing dicom RDSR information from each irradiation event
+            See rdsr_normalizer.py for more information.
+        event : int
+            Irradiation event index
+
+        Returns
+        -------
+        Tuple[np.array, np.array]
+            3*3 rotation matrix R and translation t of the phantom, such that
+            r = r_ref * R^T + t.
+
+        """
+        R = self._table_rotation(data_norm=data_norm, event=event)
+
+        t = np.array(
+            [data_norm.Tx[event], data_norm.Ty[event], data_norm.Tz[event]]
+            )
+
+        # The table rotation is conducted about the table isocenter
+        rotation_origin = np.array([0, 0, self.table_length / 2])
+
+        return R, np.matmul(R, rotation_origin) - rotation_origin + t
+
+    @staticmethod
+    def _table_rotation(data_norm: pd.DataFrame, event: int) -> np.array:
+        """Get the table rotation matrix from At1, At2, and At3."""
         rot = np.deg2rad(data_norm['At1'][event])
         tilt = np.deg2rad(data_norm['At2'][event])
         cradle = np.deg2rad(data_norm['At3'][event])
@@ -411,21 +493,11 @@ class Phantom:
                        [+np.sin(cradle), +np.cos(cradle), +0],
                        [+0, +0, +1]])
 
-        # Apply table rotation
-        self.r = np.matmul(np.matmul(R3, np.matmul(R2, R1)), (self.r).T).T
-
-        # Replace phantom to stanting position
-        self.r[:, 2] -= self.table_length/2
-
-        # Apply phantom translation
-        t = np.array(
-            [data_norm.Tx[event], data_norm.Ty[event], data_norm.Tz[event]]
-            )
-
-        self.r = self.r + t
+        return np.matmul(R3, np.matmul(R2, R1))
 
     def plot_dosemap(
-            self, dark_mode: bool = True, notebook_mode: bool = False):
+            self, dark_mode: bool = True, notebook_mode: bool = False,
+            interactivity: bool = True):
         """Plot a map of the absorbed skindose upon the patient phantom.
 
         This function creates and plots an offline plotly graph of the
@@ -439,6 +511,9 @@ class Phantom:
             set dark for for plot
         notebook_mode : bool, default is true
             optimize plot size and margin for notebooks.
+        interactivity : bool, default is True
+            show cell position and skin dose as hover info. If False, no hover
+            text is created.
 
         """
         COLOR_CANVAS, COLOR_PLOT_TEXT, COLOR_GRID, COLOR_ZERO_LINE = \
@@ -448,29 +523,30 @@ class Phantom:
 
         PLOT_MARGINS = fetch_plot_margin(notebook_mode=notebook_mode)
 
-        lat_text = [f"<b>lat:</b> {np.around(self.r[ind, 2],2)} cm<br>"
-                    for ind in range(len(self.r))]
-
-        lon_text = [f"<b>lon:</b> {np.around(self.r[ind, 0],2)} cm<br>"
-                    for ind in range(len(self.r))]
-
-        ver_text = [f"<b>ver:</b> {np.around(self.r[ind, 1],2)} cm<br>"
-                    for ind in range(len(self.r))]
+        # Round all coordinates and doses at once. The rounding is not visible
+        # in the plot, but greatly reduces the size of the plotly figure JSON.
+        r_rnd = np.around(self.r, DOSEMAP_DECIMALS)
+        dose_rnd = np.around(self.dose, DOSEMAP_DECIMALS)
 
-        dose_text = [f"<b>skin dose:</b> {round(self.dose[ind],2)} mGy"
-                     for ind in range(len(self.r))]
+        hover_text = None
+        hoverinfo = 'skip'
 
-        hover_text = [lat_text[cell] + lon_text[cell] + ver_text[cell] +
-                      dose_text[cell] for cell in range(len(self.r))]
+        if interactivity:
+            hover_text = [f"<b>lat:</b> {r_rnd[cell, 2]} cm<br>"
+                          f"<b>lon:</b> {r_rnd[cell, 0]} cm<br>"
+                          f"<b>ver:</b> {r_rnd[cell, 1]} cm<br>"
+                          f"<b>skin dose:</b> {dose_rnd[cell]} mGy"
+                          for cell in range(len(self.r))]
+            hoverinfo = 'text'
 
         # create mesh object for the phantom
         phantom_mesh = [
             go.Mesh3d(
-                x=self.r[:, 0], y=self.r[:, 1], z=self.r[:, 2],
+                x=r_rnd[:, 0], y=r_rnd[:, 1], z=r_rnd[:, 2],
                 i=self.ijk[:, 0], j=self.ijk[:, 1], k=self.ijk[:, 2],
-                intensity=self.dose, colorscale=DOSEMAP_COLORSCALE,
+                intensity=dose_rnd, colorscale=DOSEMAP_COLORSCALE,
                 showscale=True,
-                hoverinfo='text',
+                hoverinfo=hoverinfo,
                 text=hover_text, name="Human",
                 colorbar=dict(tickfont=dict(color=COLOR_PLOT_TEXT),
                               title="Skin dose [mGy]",
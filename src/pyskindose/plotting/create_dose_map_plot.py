@@ -18,4 +18,5 @@ def create_dose_map_plot(
     patient.dose = dose_map
     patient.plot_dosemap(
         dark_mode=settings.plot.dark_mode,
-        notebook_mode=settings.plot.notebook_mode)
+        notebook_mode=settings.plot.notebook_mode,
+        interactivity=settings.plot.interactivity)
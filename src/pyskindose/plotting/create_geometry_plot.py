@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 import pandas as pd
 
 from pyskindose import constants as c, position_geometry
@@ -24,20 +26,26 @@ def create_geometry_plot(normalized_data: pd.DataFrame, table: Phantom, pad: Pha
     if settings.mode not in [c.MODE_PLOT_SETUP, c.MODE_PLOT_EVENT, c.MODE_PLOT_PROCEDURE]:
         return
 
+    # The settings are immutable, override on copies of them instead
+    phantom_dim = settings.phantom.dimension
+    human_mesh = settings.phantom.human_mesh
+
     # override dense mathematical phantom in .html plotting
     if settings.phantom.model == c.PHANTOM_MODEL_PLANE:
-        settings.phantom.dimension.plane_resolution = c.RESOLUTION_SPARSE
+        phantom_dim = replace(
+            phantom_dim, plane_resolution=c.RESOLUTION_SPARSE)
     elif settings.phantom.model == c.PHANTOM_MODEL_CYLINDER:
-        settings.phantom.dimension.cylinder_resolution = c.RESOLUTION_SPARSE
+        phantom_dim = replace(
+            phantom_dim, cylinder_resolution=c.RESOLUTION_SPARSE)
 
     # override dense .stl phantoms in plot_procedure .html plotting
     if settings.mode == c.MODE_PLOT_PROCEDURE and settings.phantom.model == c.PHANTOM_MODEL_HUMAN:
-        settings.phantom.human_mesh += c.PHANTOM_HUMAN_MESH_SPARSE_MODEL_ENDING
+        human_mesh += c.PHANTOM_HUMAN_MESH_SPARSE_MODEL_ENDING
 
     patient = Phantom(
         phantom_model=settings.phantom.model,
-        phantom_dim=settings.phantom.dimension,
-        human_mesh=settings.phantom.human_mesh)
+        phantom_dim=phantom_dim,
+        human_mesh=human_mesh)
 
     # position objects in starting position
     position_geometry(
@@ -1,25 +1,105 @@
-import json
-from typing import Union
+import warnings
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Optional, Union
+
+try:
+    from typing import Literal
+except ImportError:  # Python < 3.8
+    from typing_extensions import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from pyskindose.constants import (
+    DIMENSION_UNIT_CM,
+    DOSEMAP_COLORSCALE,
     KEY_PARAM_MODE,
     KEY_PARAM_RDSR_FILENAME,
     KEY_PARAM_ESTIMATE_K_TAB,
     KEY_PARAM_K_TAB_VAL,
+    KEY_PARAM_GPU,
     KEY_PARAM_PHANTOM_MODEL,
     KEY_PARAM_HUMAN_MESH,
-    OFFSET_LATERAL_KEY,
-    OFFSET_VERTICAL_KEY,
-    OFFSET_LONGITUDINAL_KEY
+    MODE_CALCULATE_DOSE,
+    MODE_PLOT_EVENT,
+    MODE_PLOT_PROCEDURE,
+    MODE_PLOT_SETUP,
+    PATIENT_ORIENTATION_FEET_FIRST_SUPINE,
+    PATIENT_ORIENTATION_HEAD_FIRST_SUPINE,
+    PHANTOM_MODEL_CYLINDER,
+    PHANTOM_MODEL_HUMAN,
+    PHANTOM_MODEL_PLANE,
+    PLOT_EVENT_INDEX_KEY,
+    RESOLUTION_DENSE,
+    RESOLUTION_SPARSE
 )
 
 
-class PyskindoseSettings:
+class _SettingsEnum(str, Enum):
+    """String enum that formats as its value, e.g. in plot titles."""
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class Mode(_SettingsEnum):
+    """Valid selections of PyskindoseSettings.mode."""
+
+    CALCULATE_DOSE = MODE_CALCULATE_DOSE
+    PLOT_SETUP = MODE_PLOT_SETUP
+    PLOT_EVENT = MODE_PLOT_EVENT
+    PLOT_PROCEDURE = MODE_PLOT_PROCEDURE
+
+
+class PatientOrientation(_SettingsEnum):
+    """Valid selections of PhantomSettings.patient_orientation."""
+
+    HEAD_FIRST_SUPINE = PATIENT_ORIENTATION_HEAD_FIRST_SUPINE
+    FEET_FIRST_SUPINE = PATIENT_ORIENTATION_FEET_FIRST_SUPINE
+
+
+class _CaseInsensitiveEnum(_SettingsEnum):
+    """String enum whose members are looked up case insensitively."""
+
+    @classmethod
+    def _missing_(cls, value):
+        if isinstance(value, str):
+            for member in cls:
+                if member.value == value.lower():
+                    return member
+
+        return None
+
+
+class PhantomModel(_CaseInsensitiveEnum):
+    """Valid selections of PhantomSettings.model."""
+
+    PLANE = PHANTOM_MODEL_PLANE
+    CYLINDER = PHANTOM_MODEL_CYLINDER
+    HUMAN = PHANTOM_MODEL_HUMAN
+
+
+class Resolution(_CaseInsensitiveEnum):
+    """Valid skin cell resolutions of the mathematical phantoms."""
+
+    SPARSE = RESOLUTION_SPARSE
+    DENSE = RESOLUTION_DENSE
+
+
+# Shared configuration of all settings models. The settings are immutable
+# once parsed, and unknown keys (e.g. misspelled settings) raise a
+# validation error instead of being silently ignored.
+SETTINGS_MODEL_CONFIG = ConfigDict(
+    frozen=True, extra='forbid', populate_by_name=True)
+
+
+class PyskindoseSettings(BaseModel):
     """A class to store all settings required to run PySkinDose.
 
     Attributes
     ----------
-    mode : str
+    mode : Mode
         Select which mode to execute PySkinDose with. There are three
         different modes:
 
@@ -45,6 +125,10 @@ class PyskindoseSettings:
         conducted table attenatuion measurements.
     k_tab_val : float
         Value of k_tab, in range 0.0 -> 1.0.
+    gpu : bool, default is False
+        Whether the skin cell hit calculations should be run on the GPU. This
+        requires CuPy, install with the "gpu" extra, i.e.
+        pip install pyskindose[gpu].
     phantom : PhantomSettings
         Instance of class PhantomSettings containing all phantom related
         settings.
@@ -53,37 +137,160 @@ class PyskindoseSettings:
 
     """
 
-    def __init__(self, settings: Union[str, dict]):
+    model_config = SETTINGS_MODEL_CONFIG
+
+    mode: Mode = Field(alias=KEY_PARAM_MODE)
+    rdsr_filename: str = Field(alias=KEY_PARAM_RDSR_FILENAME)
+    estimate_k_tab: bool = Field(alias=KEY_PARAM_ESTIMATE_K_TAB)
+    k_tab_val: float = Field(alias=KEY_PARAM_K_TAB_VAL)
+    gpu: bool = Field(False, alias=KEY_PARAM_GPU)
+    phantom: 'PhantomSettings'
+    plot: 'Plotsettings'
+
+    @model_validator(mode='before')
+    @classmethod
+    def _move_legacy_plot_event_index(cls, data):
+        """Move a top-level plot_event_index into the plot settings.
+
+        Earlier versions of settings_example.json had plot_event_index at the
+        top level, which is still accepted with a deprecation warning.
+
+        """
+        if not isinstance(data, dict) or PLOT_EVENT_INDEX_KEY not in data:
+            return data
+
+        warnings.warn(
+            f"Top-level '{PLOT_EVENT_INDEX_KEY}' is deprecated, move it into "
+            "the 'plot' settings instead.", DeprecationWarning, stacklevel=2)
+
+        # Copy, since the given settings must not be mutated
+        data = dict(data)
+        plot_event_index = data.pop(PLOT_EVENT_INDEX_KEY)
+
+        if isinstance(data.get('plot'), dict):
+            data['plot'] = {PLOT_EVENT_INDEX_KEY: plot_event_index,
+                            **data['plot']}
+
+        return data
+
+    def __init__(self, settings: Optional[Union[str, bytes, dict]] = None,
+                 **data):
         """Initialize settings class.
 
+        The settings, including all nested phantom and plot settings, are
+        validated in a single pass by pydantic.
+
+        Parameters
+        ----------
+        settings : Union[str, bytes, dict], optional
+            Deprecated, use from_json or from_dict instead. Either a .json
+            string or a dictionary containing all the settings parameters
+            required to run PySkinDose. If omitted, the settings are instead
+            given as keyword arguments.
+
+        Raises
+        ------
+        pydantic.ValidationError
+            Raises validation error if any setting is missing, has an invalid
+            type or is not recognized.
+
+        """
+        if settings is not None:
+            warnings.warn(
+                "Passing settings to PyskindoseSettings() is deprecated, use "
+                "PyskindoseSettings.from_json or PyskindoseSettings.from_dict "
+                "instead.", DeprecationWarning, stacklevel=2)
+
+            if isinstance(settings, (str, bytes)):
+                self.__pydantic_validator__.validate_json(
+                    settings, self_instance=self)
+                return
+
+            data = settings
+
+        super().__init__(**data)
+
+    @classmethod
+    def from_json(cls, settings: Union[str, bytes]) -> 'PyskindoseSettings':
+        """Create settings from a .json string.
+
+        The .json is parsed directly by pydantic-core, without an intermediate
+        dict. The immutable settings instance is cached and shared between
+        calls with the same .json string.
+
+        Parameters
+        ----------
+        settings : Union[str, bytes]
+            .json string containing all the settings parameters required to
+            run PySkinDose. See setting_example.json in /settings/ for
+            example.
+
+        Returns
+        -------
+        PyskindoseSettings
+            Settings instance, shared with earlier calls with the same string.
+
+        """
+        return _parse_settings_cached(settings)
+
+    @classmethod
+    def from_dict(cls, settings: dict) -> 'PyskindoseSettings':
+        """Create settings from a dictionary.
+
+        Parameters
+        ----------
+        settings : dict
+            Dictionary containing all the settings parameters required to run
+            PySkinDose, see e.g. DEVELOPMENT_PARAMETERS in dev_data.py.
+
+        Returns
+        -------
+        PyskindoseSettings
+            New settings instance.
+
+        """
+        return cls.model_validate(settings)
+
+    @classmethod
+    def from_source(cls,
+                    settings: Union[str, bytes, dict, 'PyskindoseSettings']
+                    ) -> 'PyskindoseSettings':
+        """Get settings instance from any of the supported settings sources.
+
+        Since the settings are immutable, a single instance is shared between
+        all calls with the same .json string, so that it is only parsed and
+        validated once. Dictionaries are validated on every call, since they
+        may hold values that are not JSON serializable, e.g. numpy scalars.
+
         Parameters
         ----------
-        settings : Union[str, dict]
-            settings : Union[str, dict]
+        settings : Union[str, bytes, dict, PyskindoseSettings]
             Either a .json string or a dictionary containing all the settings
-            parameters required to run PySkinDose. See setting_example.json
-            in /settings/ for example.
+            parameters required to run PySkinDose, or an already parsed
+            settings instance, which is returned as is.
+
+        Returns
+        -------
+        PyskindoseSettings
+            Settings instance. For .json strings, shared with earlier calls
+            with the same string.
 
         """
-        if isinstance(settings, str):
-            tmp = json.loads(settings)
-        else:
-            tmp = settings
+        if isinstance(settings, cls):
+            return settings
 
-        self.mode = tmp[KEY_PARAM_MODE]
-        self.rdsr_filename = tmp[KEY_PARAM_RDSR_FILENAME]
-        self.estimate_k_tab = tmp[KEY_PARAM_ESTIMATE_K_TAB]
-        self.k_tab_val = tmp[KEY_PARAM_K_TAB_VAL]
-        self.phantom = PhantomSettings(ptm_dim=tmp['phantom'])
-        self.plot = Plotsettings(plt_dict=tmp['plot'])
+        if isinstance(settings, (str, bytes)):
+            return cls.from_json(settings)
 
+        return cls.from_dict(settings)
 
-class PhantomSettings:
+
+class PhantomSettings(BaseModel):
     """A class for setting all the phantom related settings required.
 
     Attributes
     ----------
-    model : str
+    model : PhantomModel
         Select which model to represent the skin surface for skindose
         calculations. Valid selections: "plane" (2D planar surface),
         "cylinder" (cylinder with elliptical cross section) or "human" (phantom
@@ -93,10 +300,10 @@ class PhantomSettings:
         model = "human" is selected. Valid selections: Any of the .stl files
         in the folder phantom_data. Enter as a string without the .stl file
         ending.
-    patient_offset : PhantomOffset
-        Instance of class PhantomOffset containing patient - table isocenter
+    patient_offset : PatientOffset
+        Instance of class PatientOffset containing patient - table isocenter
         offset.
-    patient_orientation : str
+    patient_orientation : PatientOrientation
         patient orientation on table. Choose between 'head_first_supine' and
         'feet_first_supine'.
     dimension : PhantomDimensions
@@ -105,24 +312,16 @@ class PhantomSettings:
 
     """
 
-    def __init__(self, ptm_dim: dict):
-        """Initialize phantom settings class.
+    model_config = SETTINGS_MODEL_CONFIG
 
-        Parameters
-        ----------
-        ptm_dim : PhantomDimensions
-            Instance of class PhantomDimensions containing all dimensions for
-            the mathematical phantoms. See attributes of PhantomDimensions.
-
-        """
-
-        self.model = ptm_dim[KEY_PARAM_PHANTOM_MODEL]
-        self.human_mesh = ptm_dim[KEY_PARAM_HUMAN_MESH]
-        self.patient_offset = PatientOffset(offset=ptm_dim["patient_offset"])
-        self.patient_orientation = ptm_dim["patient_orientation"]
-        self.dimension = PhantomDimensions(ptm_dim=ptm_dim['dimension'])
+    model: PhantomModel = Field(alias=KEY_PARAM_PHANTOM_MODEL)
+    human_mesh: str = Field(alias=KEY_PARAM_HUMAN_MESH)
+    patient_offset: 'PatientOffset'
+    patient_orientation: PatientOrientation
+    dimension: 'PhantomDimensions'
 
 
+@dataclass(frozen=True)
 class PhantomDimensions:
     """A class for setting the phantom dimensions for mathematical phantoms.
 
@@ -132,7 +331,7 @@ class PhantomDimensions:
         Lenth of plane phantom.
     plane_width : int
         Width of plane phantom.
-    plane_resolution: str
+    plane_resolution: Resolution
         Select either 'sparse' or 'dense' resolution of the skin cell grid
         on the surface of the plane phantom. Note: dense is more computational
         expensive.
@@ -145,39 +344,46 @@ class PhantomDimensions:
         Second radii of the cylindrical cross section of the cylindrical
         phantom, which lies in the "thickness" direction. radii a should
         be greater than radii b.
-    cylinder_resolution: str
+    cylinder_resolution: Resolution
         Select either 'sparse' or 'dense' resolution of the skin cell grid
         on the surface of the elliptical cylinder. Note: dense is more
         computational expensive.
-    table_thickness : int
+    table_thickness : float
         Thickness of the support table phantom.
-    table_length : int
+    table_length : float
         Length of the support table phantom.
-    table_width : int
+    table_width : float
         Width of the support table phantom.
-    pad_thickness : int
+    pad_thickness : float
         Thickness of the patient support table phantom.
-    pad_width : int
+    pad_width : float
         Width of the patient support table phantom.
-    pad_length : int
+    pad_length : float
         Length of the patient support table phantom.
+    unit : str, default is "cm"
+        Unit of the phantom dimensions. Only "cm" is supported.
 
     """
 
-    def __init__(self, ptm_dim: dict):
-        """Initialize phantom dimension class.
-
-        Parameters
-        ----------
-        ptm_dim : dict
-            Dictionary containing all of the phantom dimensions that are
-            appended as attributes to this class, see class attributes.
-
-        """
-        for dimension in ptm_dim.keys():
-            setattr(self, dimension, ptm_dim[dimension])
-
-
+    __pydantic_config__ = SETTINGS_MODEL_CONFIG
+
+    plane_length: int
+    plane_width: int
+    plane_resolution: Resolution
+    cylinder_length: int
+    cylinder_radii_a: float
+    cylinder_radii_b: float
+    cylinder_resolution: Resolution
+    table_thickness: float
+    table_length: float
+    table_width: float
+    pad_thickness: float
+    pad_width: float
+    pad_length: float
+    unit: Literal[DIMENSION_UNIT_CM] = DIMENSION_UNIT_CM
+
+
+@dataclass(frozen=True)
 class PatientOffset:
     """A class for setting patient - table offset.
 
@@ -188,36 +394,26 @@ class PatientOffset:
 
     Attributes
     ----------
-    d_lat : int
+    d_lat : float
         latertal offset from table isocenter
-    d_ver : int
+    d_ver : float
         Vertical offset from table isocenter
-    d_lon : int
+    d_lon : float
         longitudianl offset from table isocenter
-
-    Raises
-    ------
-    NotImplementedError
-            Raises error if other units then cm are used.
+    unit : str, default is "cm"
+        Unit of the offset. Only "cm" is supported.
 
     """
 
-    def __init__(self, offset: dict):
-        """Initialize patient-table offset class.
+    __pydantic_config__ = SETTINGS_MODEL_CONFIG
 
-        Parameters
-        ----------
-        offset : dict
-            offset in cm from the table isocenter in the lateral, vertical and
-            longitudinal direction.
-
-
-        """
-        self.d_lat = offset[OFFSET_LATERAL_KEY]
-        self.d_ver = offset[OFFSET_VERTICAL_KEY]
-        self.d_lon = offset[OFFSET_LONGITUDINAL_KEY]
+    d_lat: float
+    d_ver: float
+    d_lon: float
+    unit: Literal[DIMENSION_UNIT_CM] = DIMENSION_UNIT_CM
 
 
+@dataclass(frozen=True)
 class Plotsettings:
     """A class for setting plot settings.
 
@@ -228,27 +424,42 @@ class Plotsettings:
     notebook_mode : bool
         Set true if main is called from within a notebook.
         This optimizes plot sizing for notebook output cells.
-    plot_dosemap : bool, default is True
+    interactivity : bool, default is True
+        Whether hover info (cell position and skin dose) should be included in
+        the dose map. Disable to save time and memory for large phantoms,
+        e.g. when the dose map is only exported as a static image.
+    plot_dosemap : bool
         Whether dosemap should be plotted after dose calculation
-    max_events_for_patient_inclusion : int
+    colorscale : str, default is "jet"
+        Colorscale of the dose map.
+    max_events_for_patient_inclusion : int, default is 0
         maximum number of irradiation event for patient inclusion in
         plot_procedure. If the SR file contains more events than this number,
         the patient phantom is not shown in plot_procedure to avoid memory
         error.
-    plot_event_index : int
+    plot_event_index : int, default is 0
         Index for the event that should be plotted when mode="plot_event" is
         chosen.
 
     """
 
-    def __init__(self, plt_dict):
-        """Initialize plot settings class.
+    __pydantic_config__ = SETTINGS_MODEL_CONFIG
 
-        Parameters
-        ----------
-        plt_dict : dict
-            Dictionary containing all of the plot setting that are
-            appended as attributes to this class, see class attributes.
-        """
-        for key in plt_dict.keys():
-            setattr(self, key, plt_dict[key])
+    dark_mode: bool
+    notebook_mode: bool
+    plot_dosemap: bool
+    interactivity: bool = True
+    colorscale: str = DOSEMAP_COLORSCALE
+    max_events_for_patient_inclusion: int = 0
+    plot_event_index: int = 0
+
+
+# Resolve the forward references to the nested settings
+PhantomSettings.model_rebuild()
+PyskindoseSettings.model_rebuild()
+
+
+@lru_cache(maxsize=32)
+def _parse_settings_cached(raw_json: Union[str, bytes]) -> PyskindoseSettings:
+    """Parse and validate a settings .json string, caching the instance."""
+    return PyskindoseSettings.model_validate_json(raw_json)
@@ -5,8 +5,6 @@ DEVELOPMENT_PARAMETERS = dict(
     mode=c.MODE_PLOT_PROCEDURE,
     # RDSR filename
     rdsr_filename='s1.dcm',
-    # Irrading event index for mode='plot_event'
-    plot_event_index=12,
     # Set True to estimate table correction, or False to use measured k_tab
     estimate_k_tab=False,
     # Numeric value of estimated table correction
@@ -17,6 +15,8 @@ DEVELOPMENT_PARAMETERS = dict(
         c.MODE_DARK_MODE: True,
         # notebook mode
         c.MODE_NOTEBOOK_MODE: False,
+        # show hover info (cell position and skin dose) in dose maps
+        c.MODE_INTERACTIVITY: True,
         # choose if dosemap should be plotted after dose calculations.
         c.MODE_PLOT_DOSEMAP: False,
         # colorscale for dosemaps
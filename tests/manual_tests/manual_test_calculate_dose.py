@@ -1,10 +1,13 @@
+from dataclasses import replace
+
 from base_dev_settings import DEVELOPMENT_PARAMETERS
 from pyskindose import constants
 from pyskindose.main import main
 from pyskindose.settings_pyskindose import PyskindoseSettings
 
-settings = PyskindoseSettings(settings=DEVELOPMENT_PARAMETERS)
-settings.mode = constants.MODE_CALCULATE_DOSE
-settings.plot.plot_dosemap = True
+settings = PyskindoseSettings.from_dict(DEVELOPMENT_PARAMETERS)
+settings = settings.model_copy(update={
+    'mode': constants.MODE_CALCULATE_DOSE,
+    'plot': replace(settings.plot, plot_dosemap=True)})
 
 main(settings=settings)
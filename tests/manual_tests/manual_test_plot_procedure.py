@@ -3,7 +3,8 @@ from pyskindose import constants
 from pyskindose.main import main
 from pyskindose.settings_pyskindose import PyskindoseSettings
 
-settings = PyskindoseSettings(settings=DEVELOPMENT_PARAMETERS)
-settings.mode = constants.MODE_PLOT_PROCEDURE
+settings = PyskindoseSettings.from_dict(DEVELOPMENT_PARAMETERS)
+settings = settings.model_copy(update={
+    'mode': constants.MODE_PLOT_PROCEDURE})
 
 main(settings=settings)
@@ -3,9 +3,9 @@ from pyskindose import constants
 from pyskindose.main import main
 from pyskindose.settings_pyskindose import PyskindoseSettings
 
-settings = PyskindoseSettings(settings=DEVELOPMENT_PARAMETERS)
-settings.mode = constants.MODE_PLOT_PROCEDURE
-
-settings.rdsr_filename = 'beam_collimations.json'
+settings = PyskindoseSettings.from_dict(DEVELOPMENT_PARAMETERS)
+settings = settings.model_copy(update={
+    'mode': constants.MODE_PLOT_PROCEDURE,
+    'rdsr_filename': 'beam_collimations.json'})
 
 main(settings=settings)
@@ -15,6 +15,8 @@ DEVELOPMENT_PARAMETERS = dict(
         c.MODE_DARK_MODE: False,
         # notebook mode
         c.MODE_NOTEBOOK_MODE: False,
+        # show hover info (cell position and skin dose) in dose maps
+        c.MODE_INTERACTIVITY: True,
         # choose if dosemap should be plotted after dose calculations.
         c.MODE_PLOT_DOSEMAP: False,
         # colorscale for dosemaps
@@ -0,0 +1,55 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import sys
+
+from pyskindose import Beam, Phantom, position_geometry
+from pyskindose.dev_data import DEVELOPMENT_PARAMETERS
+from pyskindose.settings_pyskindose import PyskindoseSettings
+
+P = Path(__file__).parent.parent.parent
+sys.path.insert(1, str(P.absolute()))
+
+
+def test_check_hit_batch_agrees_with_check_hit():
+    """Test that batched hits equal the hits of each positioned event."""
+    settings = PyskindoseSettings.from_dict(DEVELOPMENT_PARAMETERS)
+    dim = settings.phantom.dimension
+
+    patient = Phantom(phantom_model="cylinder", phantom_dim=dim)
+    position_geometry(
+        patient=patient, table=Phantom("table", dim), pad=Phantom("pad", dim),
+        pad_thickness=dim.pad_thickness, patient_offset=[0, 0, -35],
+        patient_orientation=settings.phantom.patient_orientation)
+
+    # Beam angles, collimation and table positions varying between events,
+    # with two different table rotations
+    rng = np.random.default_rng(seed=0)
+    events = 10
+    data_norm = pd.DataFrame(dict(
+        Ap1=rng.uniform(-90, 90, events), Ap2=rng.uniform(-40, 40, events),
+        Ap3=np.zeros(events), DSI=np.full(events, 70.0),
+        DID=np.full(events, 110.0), DSL=np.full(events, 48.0),
+        FS_long=rng.uniform(5, 40, events), FS_lat=rng.uniform(5, 40, events),
+        At1=np.repeat([0.0, 5.0], events // 2), At2=np.zeros(events),
+        At3=np.zeros(events), Tx=rng.uniform(-10, 10, events),
+        Ty=rng.uniform(10, 30, events), Tz=rng.uniform(120, 220, events)))
+
+    beams = [Beam(data_norm=data_norm, event=event)
+             for event in range(events)]
+
+    expected = []
+    for event, beam in enumerate(beams):
+        patient.position(data_norm=data_norm, event=event)
+        expected.append(beam.check_hit(patient=patient))
+
+    rotations, translations = zip(*[
+        patient.transform(data_norm=data_norm, event=event)
+        for event in range(events)])
+
+    test = Beam.check_hit_batch(patient=patient, beams=beams,
+                                rotations=np.stack(rotations),
+                                translations=np.stack(translations))
+
+    assert np.stack(expected).any()
+    assert np.array_equal(np.stack(expected), test)
@@ -0,0 +1,138 @@
+from pathlib import Path
+import numpy as np
+import pytest
+import sys
+import types
+
+from pyskindose import _kernels
+from pyskindose._kernels import (
+    _check_hit_batch, build_bvh, check_hit_batch, check_hit_bvh,
+    check_hit_kernel)
+
+P = Path(__file__).parent.parent.parent
+sys.path.insert(1, str(P.absolute()))
+
+# Source located above origin, with a beam spanning x, z in [-1, 1] at y = 0.
+SOURCE = np.array([0.0, 2.0, 0.0])
+BEAM_NORMALS = np.array([[+0.0, +1.0, -2.0],
+                         [-2.0, +1.0, +0.0],
+                         [+0.0, +1.0, +2.0],
+                         [+2.0, +1.0, +0.0]])
+
+
+def test_check_hit_kernel_cells_inside_beam():
+    """Test that only the cells inside the beam are hit."""
+    expected = [True, True, False, False]
+
+    cells = np.array([[+0.0, +0.0, +0.0],
+                      [+0.5, +0.0, -0.5],
+                      [+1.5, +0.0, +0.0],
+                      [+0.0, +0.0, -1.5]])
+
+    test = check_hit_kernel(SOURCE, BEAM_NORMALS, cells,
+                            np.empty((0, 3)), False)
+
+    assert expected == test.tolist()
+
+
+def test_check_hit_kernel_removes_exit_path_cells():
+    """Test that cells with normals pointing away from the source are missed.
+
+    Both cells are located inside the beam, but only the first one faces the
+    X-ray source.
+    """
+    expected = [True, False]
+
+    cells = np.array([[0.0, 0.0, 0.0],
+                      [0.0, -1.0, 0.0]])
+    normals = np.array([[0.0, +1.0, 0.0],
+                        [0.0, -1.0, 0.0]])
+
+    test = check_hit_kernel(SOURCE, BEAM_NORMALS, cells, normals, True)
+
+    assert expected == test.tolist()
+
+
+def test_check_hit_batch_agrees_with_kernel():
+    """Test that the batched hit test agrees with the single event kernel."""
+    rng = np.random.default_rng(seed=0)
+    cells = rng.uniform(-2, 2, size=(500, 3))
+    normals = rng.normal(size=(500, 3))
+
+    # Second event: beam translated one unit in the lateral direction
+    sources = np.array([SOURCE, SOURCE + [0.0, 0.0, 1.0]])
+    N = np.stack([BEAM_NORMALS, BEAM_NORMALS])
+
+    expected = [check_hit_kernel(source, BEAM_NORMALS, cells, normals, True)
+                for source in sources]
+
+    test = check_hit_batch(sources, N, cells, normals, True)
+
+    assert np.array_equal(np.stack(expected), test)
+
+
+def test_check_hit_bvh_agrees_with_kernel():
+    """Test that BVH culling does not change which skin cells are hit."""
+    rng = np.random.default_rng(seed=1)
+    cells = rng.uniform(-2, 2, size=(1000, 3))
+    normals = rng.normal(size=(1000, 3))
+
+    expected = check_hit_kernel(SOURCE, BEAM_NORMALS, cells, normals, True)
+
+    test = check_hit_bvh(SOURCE, BEAM_NORMALS, cells, normals, True,
+                         SOURCE, BEAM_NORMALS, *build_bvh(cells, leaf_size=8))
+
+    assert np.array_equal(expected, test)
+
+
+def test_check_hit_batch_on_gpu_requires_cupy(monkeypatch):
+    """Test that the GPU backend raises ImportError when CuPy is missing."""
+    # A None entry in sys.modules makes "import cupy" raise ImportError
+    monkeypatch.setitem(sys.modules, 'cupy', None)
+
+    with pytest.raises(ImportError):
+        check_hit_batch(SOURCE[np.newaxis, :], BEAM_NORMALS[np.newaxis, :],
+                        np.zeros((1, 3)), np.zeros((1, 3)), True, gpu=True)
+
+
+def test_check_hit_batch_device_round_trip_with_numpy_backend():
+    """Test the device copy and return path, with NumPy standing in for CuPy.
+
+    The array module is given an asnumpy function, like CuPy, so that the
+    result is copied back to host memory the same way as on GPU.
+    """
+    rng = np.random.default_rng(seed=2)
+    cells = rng.uniform(-2, 2, size=(200, 3))
+    normals = rng.normal(size=(200, 3))
+
+    xp = types.SimpleNamespace(
+        asarray=np.asarray, newaxis=np.newaxis, einsum=np.einsum,
+        zeros=np.zeros, asnumpy=lambda arr: np.array(arr, copy=True))
+
+    expected = check_hit_kernel(SOURCE, BEAM_NORMALS, cells, normals, True)
+
+    test = _check_hit_batch(xp, SOURCE[np.newaxis, :].tolist(),
+                            BEAM_NORMALS[np.newaxis, :].tolist(),
+                            cells.tolist(), normals.tolist(), True)
+
+    assert isinstance(test, np.ndarray)
+    assert np.array_equal(expected, test[0])
+
+
+def test_check_hit_batch_chunks_give_same_result(monkeypatch):
+    """Test that processing the events in chunks does not change the hits."""
+    rng = np.random.default_rng(seed=3)
+    cells = rng.uniform(-2, 2, size=(100, 3))
+    normals = rng.normal(size=(100, 3))
+
+    sources = SOURCE + rng.uniform(-1, 1, size=(5, 3))
+    N = np.stack([BEAM_NORMALS] * 5)
+
+    expected = check_hit_batch(sources, N, cells, normals, True)
+
+    # Two events per chunk
+    monkeypatch.setattr(_kernels, 'BATCH_MAX_ARRAY_SIZE', 2 * 4 * 100)
+
+    test = check_hit_batch(sources, N, cells, normals, True)
+
+    assert np.array_equal(expected, test)
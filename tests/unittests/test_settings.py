@@ -0,0 +1,100 @@
+from pathlib import Path
+import copy
+import json
+import numpy as np
+import pytest
+import sys
+
+from pydantic import ValidationError
+
+from pyskindose.dev_data import DEVELOPMENT_PARAMETERS
+from pyskindose.settings_pyskindose import PyskindoseSettings
+
+P = Path(__file__).parent.parent.parent
+sys.path.insert(1, str(P.absolute()))
+
+
+def test_settings_from_json_equals_settings_from_dict():
+    """Test that .json string and dict settings give the same settings."""
+    expected = PyskindoseSettings.from_dict(DEVELOPMENT_PARAMETERS)
+
+    test = PyskindoseSettings.from_json(json.dumps(DEVELOPMENT_PARAMETERS))
+
+    assert expected == test
+
+
+def test_settings_rejects_unknown_keys():
+    """Test that misspelled settings are not silently ignored."""
+    settings = dict(DEVELOPMENT_PARAMETERS, rdsr_file_name='s1.dcm')
+
+    with pytest.raises(ValidationError):
+        PyskindoseSettings.from_dict(settings)
+
+
+def test_from_source_shares_instance_for_equal_settings():
+    """Test that equal .json settings are only parsed once."""
+    expected = PyskindoseSettings.from_source(
+        json.dumps(DEVELOPMENT_PARAMETERS))
+
+    test = PyskindoseSettings.from_source(json.dumps(DEVELOPMENT_PARAMETERS))
+
+    assert expected is test
+
+
+def test_from_source_accepts_dict_with_numpy_scalars():
+    """Test that dict settings need not be JSON serializable."""
+    settings = copy.deepcopy(DEVELOPMENT_PARAMETERS)
+    settings['phantom']['patient_offset']['d_lat'] = np.int64(-35)
+
+    test = PyskindoseSettings.from_source(settings)
+
+    assert test.phantom.patient_offset.d_lat == -35
+
+
+def test_settings_rejects_invalid_mode():
+    """Test that an unknown mode is rejected when the settings are loaded."""
+    settings = dict(DEVELOPMENT_PARAMETERS, mode='plot_evnt')
+
+    with pytest.raises(ValidationError):
+        PyskindoseSettings.from_dict(settings)
+
+
+def test_settings_constructor_is_deprecated():
+    """Test that passing settings to the constructor warns, but still works."""
+    expected = PyskindoseSettings.from_dict(DEVELOPMENT_PARAMETERS)
+
+    with pytest.warns(DeprecationWarning):
+        test = PyskindoseSettings(DEVELOPMENT_PARAMETERS)
+
+    assert expected == test
+
+
+def test_gpu_setting_defaults_to_cpu():
+    """Test that the hit calculations run on CPU unless gpu is set."""
+    settings = dict(DEVELOPMENT_PARAMETERS)
+    del settings['gpu']
+
+    assert not PyskindoseSettings.from_dict(settings).gpu
+    assert PyskindoseSettings.from_dict(dict(settings, gpu=True)).gpu
+
+
+def test_settings_rejects_unsupported_unit():
+    """Test that offsets in other units than cm are rejected."""
+    settings = copy.deepcopy(DEVELOPMENT_PARAMETERS)
+    settings['phantom']['patient_offset']['unit'] = 'mm'
+
+    with pytest.raises(ValidationError):
+        PyskindoseSettings.from_dict(settings)
+
+
+def test_settings_accepts_legacy_top_level_plot_event_index():
+    """Test that plot_event_index from old settings files is moved to plot."""
+    settings = copy.deepcopy(DEVELOPMENT_PARAMETERS)
+    del settings['plot']['plot_event_index']
+    settings['plot_event_index'] = 3
+
+    with pytest.warns(DeprecationWarning):
+        test = PyskindoseSettings.from_json(json.dumps(settings))
+
+    assert test.plot.plot_event_index == 3
+    assert 'plot_event_index' in settings